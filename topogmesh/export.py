@@ -1,13 +1,51 @@
+import ctypes
 import lib3mf
 from lib3mf import get_wrapper
 from .mesh import Mesh
 
+
+def _to_buffers(mesh: Mesh) -> tuple:
+    """
+    Copy the vertices and triangles of a mesh into lib3mf ctypes buffers.
+
+    Quantized meshes are only expanded to float32 here, right before the
+    handover. Position and Triangle are packed float32[3] / uint32[3]
+    structs, so the mesh buffers can be copied straight into them.
+    """
+    vertices = mesh.vertex_buffer()
+    triangles = mesh.triangle_buffer()
+    vertex_buffer = (lib3mf.Position * len(vertices)).from_buffer_copy(vertices)
+    triangle_buffer = (lib3mf.Triangle * len(triangles)).from_buffer_copy(triangles)
+    return vertex_buffer, triangle_buffer
+
+
+def _set_geometry(wrapper, mesh_obj, vertex_buffer, triangle_buffer) -> None:
+    """
+    Set the geometry of a lib3mf mesh object from prepared ctypes buffers.
+
+    `MeshObject.SetGeometry` rebuilds its arguments element by element into
+    new ctypes arrays, so the buffers are passed to the C API directly. That
+    relies on binding internals, so fall back to `SetGeometry` if a version
+    of lib3mf does not expose them.
+    """
+    setgeometry = getattr(getattr(wrapper, "lib", None), "lib3mf_meshobject_setgeometry", None)
+    if setgeometry is None or not hasattr(mesh_obj, "_handle") or not hasattr(wrapper, "checkError"):
+        mesh_obj.SetGeometry(vertex_buffer, triangle_buffer)
+        return
+    wrapper.checkError(mesh_obj, setgeometry(
+        mesh_obj._handle,
+        ctypes.c_uint64(len(vertex_buffer)),
+        vertex_buffer,
+        ctypes.c_uint64(len(triangle_buffer)),
+        triangle_buffer
+    ))
+
 def export_mesh_to_3mf(mesh: list[Mesh] | Mesh, output_path: str) -> None:
     """
     Export a Mesh or list of Mesh objects to a 3MF file.
 
-    Creates a 3MF model using lib3mf, adds the mesh vertices and triangles,
-    and writes the file to disk.
+    Creates a 3MF model using lib3mf, sets the geometry of each mesh in a
+    single bulk call, and writes the file to disk.
 
     Parameters
     ----------
@@ -35,16 +73,9 @@ def export_mesh_to_3mf(mesh: list[Mesh] | Mesh, output_path: str) -> None:
     for i, mesh in enumerate(meshes):
         mesh_obj = model.AddMeshObject()
         mesh_obj.SetName(f"MeshModel_{i}")
-
-        for vert in mesh.vertices:
-            pos = lib3mf.Position()
-            pos.Coordinates[:] = vert.x, vert.y, vert.z
-            mesh_obj.AddVertex(pos)
-
-        for tri in mesh.triangles:
-            t = lib3mf.Triangle()
-            t.Indices[:] = tri.v1, tri.v2, tri.v3
-            mesh_obj.AddTriangle(t)
+        # The buffers are temporaries, freed once lib3mf has copied them, so
+        # only one mesh's Python-side copy is alive at a time
+        _set_geometry(wrapper, mesh_obj, *_to_buffers(mesh))
 
         comp_obj.AddComponent(mesh_obj, wrapper.GetIdentityTransform())
 
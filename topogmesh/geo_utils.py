@@ -1,9 +1,22 @@
 import tempfile
+import uuid
+from functools import lru_cache
 from osgeo import gdal, osr, ogr
 from yirgacheffe.layers import RasterLayer, VectorLayer
 from pyproj import CRS
 import yirgacheffe as yg
-import geopandas as gpd
+
+@lru_cache(maxsize=128)
+def _ct_to_wgs84(src_wkt: str) -> osr.CoordinateTransformation:
+    """
+    Return a cached transformation from the given CRS to WGS84, so PROJ is
+    only initialised once per source projection.
+    """
+    src_srs = osr.SpatialReference()
+    src_srs.ImportFromWkt(src_wkt)
+    target_srs = osr.SpatialReference()
+    target_srs.ImportFromEPSG(4326)  # WGS84
+    return osr.CoordinateTransformation(src_srs, target_srs)
 
 def raster_to_utm(input_raster: RasterLayer) -> RasterLayer:
     """
@@ -24,42 +37,46 @@ def raster_to_utm(input_raster: RasterLayer) -> RasterLayer:
     RasterLayer
         A copy of the input raster reprojected to the correct UTM zone.
     """
-    with tempfile.NamedTemporaryFile(suffix='.tif', delete=True) as tmpfile:
-        input_raster.to_geotiff(tmpfile.name)
-        ds = gdal.Open(tmpfile.name)
-    gt = ds.GetGeoTransform()
-    x_center = gt[0] + (ds.RasterXSize * gt[1]) / 2
-    y_center = gt[3] + (ds.RasterYSize * gt[5]) / 2
-
-    src_srs = osr.SpatialReference()
-    src_srs.ImportFromWkt(ds.GetProjection())
-
-    if not src_srs.IsGeographic():
-        target_srs = osr.SpatialReference()
-        target_srs.ImportFromEPSG(4326)  # WGS84
-        ct = osr.CoordinateTransformation(src_srs, target_srs)
-        x_center, y_center, _ = ct.TransformPoint(x_center, y_center)
-
-    utm_zone = int((x_center + 180) / 6) + 1
-    hemisphere = 'north' if y_center >= 0 else 'south'
-
-    srs = osr.SpatialReference()
-    srs.SetUTM(utm_zone, hemisphere == 'north')
-    srs.SetWellKnownGeogCS("WGS84")
-
-    dst_wkt = srs.ExportToWkt()
-
-    with tempfile.NamedTemporaryFile(suffix='.tif', delete=True) as tmpfile:
-        gdal.Warp(
-            tmpfile.name,
+    # Both the source copy and the warped raster are kept in memory rather
+    # than round-tripped through temporary GeoTIFFs on disk.
+    src_path = f"/vsimem/{uuid.uuid4().hex}.tif"
+    input_raster.to_geotiff(src_path)
+    # The in-memory copy lives until unlinked, so release it even if the
+    # reprojection fails
+    try:
+        ds = gdal.Open(src_path)
+        gt = ds.GetGeoTransform()
+        x_center = gt[0] + (ds.RasterXSize * gt[1]) / 2
+        y_center = gt[3] + (ds.RasterYSize * gt[5]) / 2
+
+        src_wkt = ds.GetProjection()
+        src_srs = osr.SpatialReference()
+        src_srs.ImportFromWkt(src_wkt)
+
+        if not src_srs.IsGeographic():
+            ct = _ct_to_wgs84(src_wkt)
+            x_center, y_center, _ = ct.TransformPoint(x_center, y_center)
+
+        utm_zone = int((x_center + 180) / 6) + 1
+        hemisphere = 'north' if y_center >= 0 else 'south'
+
+        srs = osr.SpatialReference()
+        srs.SetUTM(utm_zone, hemisphere == 'north')
+        srs.SetWellKnownGeogCS("WGS84")
+
+        dst_wkt = srs.ExportToWkt()
+
+        warped_ds = gdal.Warp(
+            "",
             ds,
             dstSRS=dst_wkt,
-            format="GTiff"
+            format="MEM"
         )
+    finally:
+        ds = None
+        gdal.Unlink(src_path)
 
-        warped_raster = yg.read_raster(tmpfile.name)
-
-    return warped_raster
+    return RasterLayer(warped_ds)
 
 def shape_to_utm(reference_layer: RasterLayer, shape_path: str) -> VectorLayer:
     """
@@ -82,6 +99,8 @@ def shape_to_utm(reference_layer: RasterLayer, shape_path: str) -> VectorLayer:
         A vector layer with geometries transformed to the raster's CRS and
         compatible for use with operations on the reference raster.
     """
+    import geopandas as gpd
+
     src_crs = CRS.from_wkt(reference_layer.map_projection.name)
     with tempfile.NamedTemporaryFile(suffix='.geojson', delete=True) as tmpfile:
         gdf = gpd.read_file(shape_path)
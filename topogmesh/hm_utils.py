@@ -3,7 +3,7 @@ from yirgacheffe.layers import RasterLayer, VectorLayer
 import yirgacheffe.operators as yo
 
 
-def read_full_layer(raster: RasterLayer, dtype: type = float) -> np.ndarray:
+def read_full_layer(raster: RasterLayer, dtype: type = np.float32) -> np.ndarray:
     """
     Return the entire contents of a RasterLayer based on the specifications 
     of its window.
@@ -13,7 +13,8 @@ def read_full_layer(raster: RasterLayer, dtype: type = float) -> np.ndarray:
     raster : RasterLayer
         A yirgacheffe raster layer
     dtype : type
-        The typing of the contents of the array e.g. float or bool
+        The typing of the contents of the array e.g. np.float32 or bool.
+        Defaults to np.float32.
 
     Returns
     -------
@@ -25,7 +26,7 @@ def read_full_layer(raster: RasterLayer, dtype: type = float) -> np.ndarray:
         raster.window.yoff,
         raster.window.xsize,
         raster.window.ysize
-    ).astype(dtype)
+    ).astype(dtype, copy=False)
     return array
 
 
@@ -48,11 +49,47 @@ def apply_mask(raster: RasterLayer, mask: VectorLayer, mask_with_nans: bool = Tr
     RaterLayer
         The resultant masked RasterLayer
     """
-    if mask_with_nans:
-        mask = yo.where(mask == 0, np.nan, mask)
-
-    mask_operation = raster * mask
+    mask_operation = _mask_operation(raster, mask, mask_with_nans)
     masked_raster = RasterLayer.empty_raster_layer_like(mask_operation)
     mask_operation.save(masked_raster)
 
-    return masked_raster
\ No newline at end of file
+    return masked_raster
+
+
+def read_masked_layer(raster: RasterLayer, mask: VectorLayer, mask_with_nans: bool = True, dtype: type = np.float32) -> np.ndarray:
+    """
+    Apply a yirgacheffe VectorLayer as a mask to a RasterLayer and return the
+    result directly as an array.
+
+    Unlike `apply_mask` followed by `read_full_layer`, the masked values are
+    never saved into an intermediate RasterLayer and read back out.
+
+    Parameters
+    ----------
+    raster : RasterLayer
+        The layer which the mask is applied to.
+    mask : VectorLayer
+        The mask being applied to the raster.
+    mask_with_nans : bool
+        Sets values outside the polygon to NaN if True, otherwise to 0.
+    dtype : type
+        The typing of the contents of the array e.g. np.float32 or bool.
+        Defaults to np.float32.
+
+    Returns
+    -------
+    np.ndarray
+        The masked contents of the raster within the area of the mask.
+    """
+    mask_operation = _mask_operation(raster, mask, mask_with_nans)
+    window = mask_operation.window
+    array = mask_operation.read_array(0, 0, window.xsize, window.ysize).astype(dtype, copy=False)
+    return array
+
+
+def _mask_operation(raster: RasterLayer, mask: VectorLayer, mask_with_nans: bool):
+    # Multiplying by the mask keeps the result to the intersection of the
+    # raster and the polygon; a where() on its own would take the polygon's
+    # area and pad any part not covered by the raster with 0.
+    fill_value = np.nan if mask_with_nans else 0
+    return raster * yo.where(mask == 0, fill_value, 1)
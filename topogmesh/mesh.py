@@ -1,3 +1,6 @@
+import numpy as np
+
+
 class Triangle:
     """
     Represents a triangle in a mesh by storing the indices of its vertices.
@@ -45,33 +48,169 @@ class Mesh:
     """
     Represents a 3D mesh composed of vertices and triangles with spatial dimensions.
 
+    Vertices and triangles are stored as packed NumPy arrays rather than lists
+    of `Vertex` and `Triangle` objects, so they can be handed to exporters
+    without any per-element Python work.
+
     Attributes
     ----------
-    _vertices : list of Vertex
-        Internal list of vertices defining the mesh geometry.
-    _triangles : list of Triangle
-        Internal list of triangles referencing vertex indices to form mesh faces.
-    _dimensions : tuple of float
-        The (width, height) dimensions of the mesh in model units.
+    _vertices : np.ndarray
+        Internal (N, 3) float32 array of vertex positions.
+    _triangles : np.ndarray
+        Internal (M, 3) int32 array of vertex indices forming the mesh faces.
 
     Properties
     ----------
-    vertices : list of Vertex
-        Read-only property to access the list of vertices.
-    triangles : list of Triangle
-        Read-only property to access the list of triangles.
+    vertices : np.ndarray
+        Read-only property to access the (N, 3) array of vertices.
+    triangles : np.ndarray
+        Read-only property to access the (M, 3) array of triangles.
     """
-    def __init__(self, vertices: list[Vertex], triangles: list[Triangle]):
-        self._vertices = vertices
-        self._triangles = triangles
+    def __init__(self, vertices: np.ndarray | list[Vertex], triangles: np.ndarray | list[Triangle]):
+        if len(vertices) and isinstance(vertices[0], Vertex):
+            vertices = [(v.x, v.y, v.z) for v in vertices]
+        if len(triangles) and isinstance(triangles[0], Triangle):
+            triangles = [(t.v1, t.v2, t.v3) for t in triangles]
+
+        self._vertices = np.ascontiguousarray(vertices, dtype=np.float32).reshape(-1, 3)
+        self._triangles = np.ascontiguousarray(triangles, dtype=np.int32).reshape(-1, 3)
 
     def __repr__(self):
         return f"Mesh(Vertices: {self._vertices}, Triangles: {self._triangles})"
-    
+
     @property
     def vertices(self):
         return self._vertices
-    
+
     @property
     def triangles(self):
-        return self._triangles
\ No newline at end of file
+        return self._triangles
+
+    def vertex(self, index: int) -> Vertex:
+        """
+        Return a single vertex of the mesh as a `Vertex` object.
+        """
+        x, y, z = self.vertices[index].tolist()
+        return Vertex(x, y, z)
+
+    def triangle(self, index: int) -> Triangle:
+        """
+        Return a single triangle of the mesh as a `Triangle` object.
+        """
+        v1, v2, v3 = self.triangles[index].tolist()
+        return Triangle(v1, v2, v3)
+
+    def vertex_buffer(self) -> memoryview:
+        """
+        Return the vertices as a buffer of packed little-endian float32
+        (x, y, z) triples, without copying on little-endian machines.
+        """
+        return memoryview(self.vertices.astype("<f4", copy=False))
+
+    def triangle_buffer(self) -> memoryview:
+        """
+        Return the triangles as a buffer of packed little-endian 32-bit
+        vertex index triples, without copying on little-endian machines.
+        Indices are never negative, so the bytes are also valid uint32.
+        """
+        return memoryview(self.triangles.astype("<i4", copy=False))
+
+    def quantize(self, grid_scale: float | None = None) -> "QuantizedMesh":
+        """
+        Return a copy of the mesh with its vertex positions quantized to uint16.
+
+        Parameters
+        ----------
+        grid_scale : float, optional
+            Distance between adjacent grid vertices, as passed to `create_mesh`.
+            If given, x and y are stored as integer grid indices, so meshes built
+            on a regular grid keep their exact grid positions. Otherwise every
+            axis is spread over the full uint16 range.
+
+        Returns
+        -------
+        QuantizedMesh
+            The quantized mesh, sharing this mesh's triangle array.
+
+        Raises
+        ------
+        ValueError
+            If `grid_scale` is not positive, the vertices do not lie on a grid
+            with that spacing, or the grid is too large for uint16 indices.
+        """
+        if len(self._vertices):
+            origin = self._vertices.min(axis=0)
+            extent = self._vertices.max(axis=0) - origin
+        else:
+            origin = extent = np.zeros(3, dtype=np.float32)
+        step = np.where(extent > 0, extent / QuantizedMesh.LEVELS, 1).astype(np.float32)
+        if grid_scale is not None:
+            if not grid_scale > 0:
+                raise ValueError(f"Grid scale must be positive, not {grid_scale}")
+            grid_positions = (self._vertices[:, :2] - origin[:2]) / grid_scale
+            if not np.allclose(grid_positions, np.rint(grid_positions)):
+                raise ValueError(f"Mesh vertices do not lie on a grid with spacing {grid_scale}")
+            if np.any(extent[:2] / grid_scale > QuantizedMesh.LEVELS):
+                raise ValueError("Mesh grid is too large to store as uint16 indices")
+            step[:2] = grid_scale
+        positions = np.rint((self._vertices - origin) / step).astype(np.uint16)
+        return QuantizedMesh(positions, origin, step, self._triangles)
+
+
+class QuantizedMesh(Mesh):
+    """
+    Represents a 3D mesh whose vertex positions are stored as uint16 offsets
+    from the per-axis minimum of the mesh, as in Cesium's quantized-mesh format.
+
+    Positions are only expanded back to float32 when `vertices` is accessed,
+    e.g. by the 3MF exporter.
+
+    Attributes
+    ----------
+    _positions : np.ndarray
+        Internal (N, 3) uint16 array of quantized vertex positions.
+    _origin : np.ndarray
+        The (3,) float32 minimum of each axis.
+    _step : np.ndarray
+        The (3,) float32 size of one quantization level on each axis.
+    _triangles : np.ndarray
+        Internal (M, 3) int32 array of vertex indices forming the mesh faces.
+    """
+    LEVELS = np.iinfo(np.uint16).max
+
+    def __init__(self, positions: np.ndarray, origin: np.ndarray, step: np.ndarray, triangles: np.ndarray):
+        self._positions = np.ascontiguousarray(positions, dtype=np.uint16).reshape(-1, 3)
+        self._origin = np.asarray(origin, dtype=np.float32)
+        self._step = np.asarray(step, dtype=np.float32)
+        self._triangles = np.ascontiguousarray(triangles, dtype=np.int32).reshape(-1, 3)
+
+    def __repr__(self):
+        return f"QuantizedMesh(Vertices: {self.vertices}, Triangles: {self._triangles})"
+
+    @property
+    def vertices(self):
+        return self._origin + self._positions.astype(np.float32) * self._step
+
+    def vertex(self, index: int) -> Vertex:
+        """
+        Return a single vertex of the mesh as a `Vertex` object, decoding
+        only that vertex.
+        """
+        x, y, z = (self._origin + self._positions[index].astype(np.float32) * self._step).tolist()
+        return Vertex(x, y, z)
+
+    def quantize(self, grid_scale: float | None = None) -> "QuantizedMesh":
+        """
+        Return the mesh itself, as it is already quantized.
+
+        Raises
+        ------
+        ValueError
+            If `grid_scale` is given and does not match the x/y step the mesh
+            was quantized with.
+        """
+        if grid_scale is not None and not np.allclose(self._step[:2], grid_scale):
+            raise ValueError(
+                f"Mesh is already quantized with x/y steps {self._step[:2].tolist()}, not {grid_scale}"
+            )
+        return self
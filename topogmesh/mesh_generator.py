@@ -1,13 +1,18 @@
 import numpy as np
-from .hm_utils import read_full_layer, apply_mask
+from concurrent.futures import ThreadPoolExecutor
+from .hm_utils import read_full_layer, read_masked_layer, apply_mask
 from .geo_utils import raster_to_utm, shape_to_utm
-from .mesh import Mesh, Vertex, Triangle
+from .mesh import Mesh
 from .webscraper import mask_from_osm_tags
 import yirgacheffe as yg
 import yirgacheffe.operators as yo
+from yirgacheffe.layers import RasterLayer, VectorLayer
 
+MAX_OSM_QUERIES = 2
 
-def create_mesh(height_map: np.ndarray, scale: float = 1, base_map: np.ndarray | None = None) -> Mesh:
+
+def create_mesh(height_map: np.ndarray, scale: float = 1, base_map: np.ndarray | None = None,
+                vertex_order: str = "raster") -> Mesh:
     """
     Generate a 3D mesh from a 2D height map.
 
@@ -19,6 +24,11 @@ def create_mesh(height_map: np.ndarray, scale: float = 1, base_map: np.ndarray |
         2D array of the height of the base of the mesh. Default is np.zeros.
     scale : float, optional
         Distance between adjacent vertices in model units. Default is 1.
+    vertex_order : {"raster", "morton"}, optional
+        Order in which the vertices of each layer are stored. "raster" keeps
+        grid order; "morton" renumbers them along a Z-order curve so triangles
+        spanning rows reference nearby vertices, at a noticeable extra cost
+        on large grids. Default is "raster".
 
     Returns
     -------
@@ -26,109 +36,135 @@ def create_mesh(height_map: np.ndarray, scale: float = 1, base_map: np.ndarray |
         A mesh object containing vertices and triangles representing the terrain,
         including a base and side walls.
     """
+    if vertex_order not in ("raster", "morton"):
+        raise ValueError(f"Unknown vertex order: {vertex_order!r}")
     if base_map is None:
         base_map = np.zeros_like(height_map)
 
     valid = ~np.isnan(height_map)
     x_size, y_size = height_map.shape
 
-    vert_idx = np.full((x_size, y_size), -1, dtype=int)
-    verts = []
-    # surface vertices
-    for i in range(x_size):
-        for j in range(y_size):
-            if valid[i, j]:
-                vert_idx[i, j] = len(verts)
-                verts.append(Vertex(i * scale, j * scale, height_map[i, j]))
-
-    base_offset = len(verts)
-    # base vertices
-    for i in range(x_size):
-        for j in range(y_size):
-            if valid[i, j]:
-                verts.append(Vertex(i * scale, j * scale, base_map[i, j]))
-
-
-    tris = []
-    # surface triangles
-    for i in range(x_size-1):
-        for j in range(y_size-1):
-            a = vert_idx[i  , j]
-            b = vert_idx[i+1, j]
-            c = vert_idx[i  , j+1]
-            d = vert_idx[i+1, j+1]
-            if min(a, b, c, d) > 0:
-                tris.append(Triangle(a, b, c))
-                tris.append(Triangle(b, d, c))
-
-    # base triangles
-    for i in range(x_size-1):
-        for j in range(y_size-1):
-            a = vert_idx[i  , j]
-            b = vert_idx[i+1, j]
-            c = vert_idx[i  , j+1]
-            d = vert_idx[i+1, j+1]
-            if min(a, b, c, d) >= 0:
-                tris.append(Triangle(base_offset + a, base_offset + c, base_offset + b))
-                tris.append(Triangle(base_offset + b, base_offset + c, base_offset + d))
-
-    #Side triangles
-    for i in range(x_size):
-        for j in range(y_size):
-            if not valid[i, j]:
-                continue
-
-            curr_top = vert_idx[i, j]
-            curr_bot = base_offset + curr_top
-
-            # Check each direction for boundary walls
-            # Right edge
-            if i < x_size-1 and valid[i+1, j]:
-                # Check if we need a wall between these cells
-                need_wall = False
-                if j == 0 or not valid[i, j-1] or not valid[i+1, j-1]:
-                    need_wall = True
-                elif j == y_size-1 or not valid[i, j+1] or not valid[i+1, j+1]:
-                    need_wall = True
-
-                if need_wall:
-                    right_top = vert_idx[i+1, j]
-                    right_bot = base_offset + right_top
-                    # Create wall facing outward from invalid region
-                    if j == 0 or (j > 0 and (not valid[i, j-1] or not valid[i+1, j-1])):
-                        # Wall faces toward negative j (up)
-                        tris.append(Triangle(curr_top, curr_bot, right_top))
-                        tris.append(Triangle(right_top, curr_bot, right_bot))
-                    else:
-                        # Wall faces toward positive j (down)
-                        tris.append(Triangle(curr_top, right_top, curr_bot))
-                        tris.append(Triangle(right_top, right_bot, curr_bot))
-
-            # Down edge
-            if j < y_size-1 and valid[i, j+1]:
-                # Check if we need a wall between these cells
-                need_wall = False
-                if i == 0 or not valid[i-1, j] or not valid[i-1, j+1]:
-                    need_wall = True
-                elif i == x_size-1 or not valid[i+1, j] or not valid[i+1, j+1]:
-                    need_wall = True
-
-                if need_wall:
-                    down_top = vert_idx[i, j+1]
-                    down_bot = base_offset + down_top
-                    # Create wall facing outward from invalid region
-                    if i == 0 or (i > 0 and (not valid[i-1, j] or not valid[i-1, j+1])):
-                        # Wall faces toward negative i (left)
-                        tris.append(Triangle(curr_top, down_top, curr_bot))
-                        tris.append(Triangle(down_top, down_bot, curr_bot))
-                    else:
-                        # Wall faces toward positive i (right)
-                        tris.append(Triangle(curr_top, curr_bot, down_top))
-                        tris.append(Triangle(down_top, curr_bot, down_bot))
+    # Number the valid cells in raster order, -1 marks cells outside the model
+    vert_idx = np.full((x_size, y_size), -1, dtype=np.int32)
+    vert_idx[valid] = np.arange(np.count_nonzero(valid))
+    base_offset = np.count_nonzero(valid)
+
+    # Surface vertices followed by base vertices. Grid coordinates are looked
+    # up from one scaled row/column table rather than multiplied per vertex.
+    ii, jj = np.nonzero(valid)
+    xs = np.arange(x_size, dtype=np.float32) * np.float32(scale)
+    ys = np.arange(y_size, dtype=np.float32) * np.float32(scale)
+    verts = np.empty((2 * base_offset, 3), dtype=np.float32)
+    verts[:base_offset, 0] = verts[base_offset:, 0] = xs[ii]
+    verts[:base_offset, 1] = verts[base_offset:, 1] = ys[jj]
+    verts[:base_offset, 2] = height_map[valid]
+    verts[base_offset:, 2] = base_map[valid]
+
+    # Corners of every grid quad whose four cells are all valid
+    quad = valid[:-1, :-1] & valid[1:, :-1] & valid[:-1, 1:] & valid[1:, 1:]
+    a = vert_idx[:-1, :-1][quad]
+    b = vert_idx[1:, :-1][quad]
+    c = vert_idx[:-1, 1:][quad]
+    d = vert_idx[1:, 1:][quad]
+
+    # Surface triangles
+    surface_tris = _triangle_pairs((a, b, c), (b, d, c))
+
+    # Base triangles
+    a_b, b_b, c_b, d_b = a + base_offset, b + base_offset, c + base_offset, d + base_offset
+    base_tris = _triangle_pairs((a_b, c_b, b_b), (b_b, c_b, d_b))
+
+    # Side triangles. Padding with False treats cells beyond the grid edge
+    # as invalid, so the edge of the grid gets walls like any other boundary.
+    padded = np.pad(valid, 1)
+
+    # Right edges: a wall is needed between (i, j) and (i+1, j) when either
+    # neighbouring column is open
+    pair = valid[:-1, :] & valid[1:, :]
+    open_up = ~(padded[1:x_size, :y_size] & padded[2:x_size+1, :y_size])
+    open_down = ~(padded[1:x_size, 2:] & padded[2:x_size+1, 2:])
+    need_wall = pair & (open_up | open_down)
+
+    # Wall faces toward negative j (up) where that side is open, else positive j (down)
+    up = need_wall & open_up
+    curr_top, right_top = vert_idx[:-1, :][up], vert_idx[1:, :][up]
+    curr_bot, right_bot = curr_top + base_offset, right_top + base_offset
+    up_tris = _triangle_pairs((curr_top, curr_bot, right_top), (right_top, curr_bot, right_bot))
+
+    down = need_wall & ~open_up
+    curr_top, right_top = vert_idx[:-1, :][down], vert_idx[1:, :][down]
+    curr_bot, right_bot = curr_top + base_offset, right_top + base_offset
+    down_tris = _triangle_pairs((curr_top, right_top, curr_bot), (right_top, right_bot, curr_bot))
+
+    # Down edges: a wall is needed between (i, j) and (i, j+1) when either
+    # neighbouring row is open
+    pair = valid[:, :-1] & valid[:, 1:]
+    open_left = ~(padded[:x_size, 1:y_size] & padded[:x_size, 2:y_size+1])
+    open_right = ~(padded[2:, 1:y_size] & padded[2:, 2:y_size+1])
+    need_wall = pair & (open_left | open_right)
+
+    # Wall faces toward negative i (left) where that side is open, else positive i (right)
+    left = need_wall & open_left
+    curr_top, down_top = vert_idx[:, :-1][left], vert_idx[:, 1:][left]
+    curr_bot, down_bot = curr_top + base_offset, down_top + base_offset
+    left_tris = _triangle_pairs((curr_top, down_top, curr_bot), (down_top, down_bot, curr_bot))
+
+    right = need_wall & ~open_left
+    curr_top, down_top = vert_idx[:, :-1][right], vert_idx[:, 1:][right]
+    curr_bot, down_bot = curr_top + base_offset, down_top + base_offset
+    right_tris = _triangle_pairs((curr_top, curr_bot, down_top), (down_top, curr_bot, down_bot))
+
+    tris = np.concatenate([surface_tris, base_tris, up_tris, down_tris, left_tris, right_tris])
+
+    if vertex_order == "morton":
+        # Renumber the vertices of each layer in Z-order rather than raster
+        # order, so triangles spanning rows reference vertices stored close together
+        z_order = np.argsort(_morton_code(ii, jj), kind="stable")
+        new_idx = np.empty(len(verts), dtype=np.int32)
+        new_idx[z_order] = np.arange(base_offset)
+        new_idx[z_order + base_offset] = np.arange(base_offset) + base_offset
+        verts = verts[np.concatenate([z_order, z_order + base_offset])]
+        tris = new_idx[tris]
 
     return Mesh(verts, tris)
 
 
+def _triangle_pairs(first: tuple[np.ndarray, ...], second: tuple[np.ndarray, ...]) -> np.ndarray:
+    """
+    Interleave two sets of triangles, given as tuples of corner index arrays,
+    into a single (2N, 3) array so each pair of triangles stays adjacent.
+    """
+    return np.stack([*first, *second], axis=1).reshape(-1, 3)
+
+
+def _morton_code(i: np.ndarray, j: np.ndarray) -> np.ndarray:
+    """
+    Interleave the bits of the row and column indices of each cell, giving
+    its position along a Z-order (Morton) curve through the grid.
+    """
+    def spread_bits(v):
+        v = v.astype(np.uint64) & np.uint64(0xFFFFFFFF)
+        for shift, mask in ((16, 0x0000FFFF0000FFFF), (8, 0x00FF00FF00FF00FF),
+                            (4, 0x0F0F0F0F0F0F0F0F), (2, 0x3333333333333333),
+                            (1, 0x5555555555555555)):
+            v = (v | (v << np.uint64(shift))) & np.uint64(mask)
+        return v
+
+    return spread_bits(i) | (spread_bits(j) << np.uint64(1))
+
+
+def _fetch_osm_masks(reference_layer: RasterLayer, osm_tags: list[dict]) -> list[VectorLayer | None]:
+    """
+    Fetch the mask for each set of OSM tags, in the same order as `osm_tags`.
+
+    The queries are network-bound and independent so are run concurrently,
+    but only `MAX_OSM_QUERIES` at a time to stay within the Overpass API's
+    rate limits.
+    """
+    with ThreadPoolExecutor(max_workers=MAX_OSM_QUERIES) as executor:
+        return list(executor.map(lambda tags: mask_from_osm_tags(reference_layer, tags), osm_tags))
+
+
 def mesh_from_shape_file(shp_path: str, 
                          tif_paths: list[str], 
                          max_height: float, 
@@ -174,30 +210,31 @@ def mesh_from_shape_file(shp_path: str,
 
     Z_OFF = base_height - np.nanmin(height_map)
     MAX_HEIGHT = np.nanmax(height_map) + Z_OFF
+    Z_SCALE = max_height / MAX_HEIGHT
     SCALE = max_length / max(height_map.shape)
     def normalise(height_map):
-        zeroed_height_map = height_map + Z_OFF
-        normalised_height_map = zeroed_height_map / MAX_HEIGHT * max_height
+        # One allocation, then scale in place rather than a temporary per operator
+        normalised_height_map = height_map + Z_OFF
+        normalised_height_map *= Z_SCALE
         return normalised_height_map
 
     normalised_height_map = normalise(height_map)
     composite_mesh = [create_mesh(normalised_height_map, SCALE)]
 
-    unassigned_layer_mask = np.ones(normalised_height_map.shape, dtype=float)
-    for tags in osm_tags:
-        mask = mask_from_osm_tags(masked_rasters, tags)
+    unassigned_layer_mask = np.ones(normalised_height_map.shape, dtype=bool)
+    # Layers are built in order, as each one only claims pixels not already
+    # taken by an earlier layer
+    for mask in _fetch_osm_masks(masked_rasters, osm_tags):
         if mask is not None:
             next_layer = apply_mask(masked_rasters, mask)
             next_layer.set_window_for_union(masked_rasters.area)
 
             # Change once yirgacheffe pads with no data instead of 0
             next_layer = yo.where(next_layer == 0, np.nan, next_layer)
-            next_layer = apply_mask(next_layer, polygon_layer)
+            layer_height_map = read_masked_layer(next_layer, polygon_layer)
 
-            layer_height_map = read_full_layer(next_layer)
-
-            filtered_height_map = layer_height_map * unassigned_layer_mask
-            unassigned_layer_mask = np.where(np.isnan(layer_height_map), unassigned_layer_mask, np.nan)
+            filtered_height_map = np.where(unassigned_layer_mask, layer_height_map, np.nan)
+            unassigned_layer_mask &= np.isnan(layer_height_map)
 
             next_mesh = create_mesh(
                 normalise(filtered_height_map) + LAMINAR_HEIGHT,
@@ -249,19 +286,26 @@ def mesh_from_uk_shape(shp_path: str,
       within `max_length`.
     - Each OSM tag layer is applied on top of the base terrain, masking
       areas not matching the tag.
-    - NaN values in input rasters are treated as zero.
+    - NaN values in the DTM are treated as zero, and NaN values in the DSM
+      are raised to 1 unit (`LAMINAR_HEIGHT`) above the terrain, the same
+      floor applied to any DSM values below the DTM.
     """
     dsm_layer = yg.read_rasters(fr_dsm_paths)
     dtm_layer = yg.read_rasters(dtm_paths)
     polygon_layer = shape_to_utm(dsm_layer, shp_path)
 
     # Remove NODATA holes
-    dsm_layer = yo.where(dsm_layer.isnan(), 0, dsm_layer)
     dtm_layer = yo.where(dtm_layer.isnan(), 0, dtm_layer)
 
-    #Ensure dsm_layer is above dtm
+    #Ensure dsm_layer is above dtm. NODATA holes in the dsm are raised to the
+    #same floor in one expression, rather than zeroed in a separate pass first.
     LAMINAR_HEIGHT = 1
-    dsm_layer = yo.where(dsm_layer < dtm_layer + LAMINAR_HEIGHT, dtm_layer + LAMINAR_HEIGHT, dsm_layer)
+    dsm_floor = dtm_layer + LAMINAR_HEIGHT
+    dsm_layer = yo.where(
+        dsm_layer.isnan(),
+        dsm_floor,
+        yo.where(dsm_layer < dsm_floor, dsm_floor, dsm_layer)
+    )
 
     masked_dsm = apply_mask(dsm_layer, polygon_layer)
     masked_dtm = apply_mask(dtm_layer, polygon_layer)
@@ -271,27 +315,28 @@ def mesh_from_uk_shape(shp_path: str,
     Z_OFF = base_height - np.nanmin(dtm)
     SCALE = max_length / max(dtm.shape)
 
-    normalised_dtm = (dtm + Z_OFF) * SCALE
+    normalised_dtm = dtm + Z_OFF
+    normalised_dtm *= SCALE
 
     composite_mesh = [create_mesh(normalised_dtm, scale=SCALE)]
 
-    unassigned_layer_mask = np.ones(dtm.shape, dtype=float)
-    for tags in osm_tags:
-        mask = mask_from_osm_tags(masked_dsm, tags)
+    unassigned_layer_mask = np.ones(dtm.shape, dtype=bool)
+    # Layers are built in order, as each one only claims pixels not already
+    # taken by an earlier layer
+    for mask in _fetch_osm_masks(masked_dsm, osm_tags):
         if mask is not None:
             next_layer = apply_mask(masked_dsm, mask)
             next_layer.set_window_for_union(masked_dtm.area)
 
             # Change once yirgacheffe pads with no data instead of 0
             next_layer = yo.where(next_layer == 0, np.nan, next_layer)
-            next_layer = apply_mask(next_layer, polygon_layer)
-
-            height_map = read_full_layer(next_layer)
+            height_map = read_masked_layer(next_layer, polygon_layer)
 
-            filtered_height_map = height_map * unassigned_layer_mask
-            unassigned_layer_mask = np.where(np.isnan(height_map), unassigned_layer_mask, np.nan)
+            filtered_height_map = np.where(unassigned_layer_mask, height_map, np.nan)
+            unassigned_layer_mask &= np.isnan(height_map)
 
-            normalised_height_map = (filtered_height_map + Z_OFF) * SCALE
+            normalised_height_map = filtered_height_map + Z_OFF
+            normalised_height_map *= SCALE
             composite_mesh.append(create_mesh(normalised_height_map, base_map=normalised_dtm, scale=SCALE))
 
     return composite_mesh
@@ -319,10 +364,14 @@ def mesh_from_tif(tif_path: str, max_height: float, max_length: float, base_heig
     """
     raster = yg.read_raster(tif_path)
 
-    height_map = read_full_layer(raster)
+    normalised_height_map = read_full_layer(raster)
 
-    zeroed_height_map = height_map + base_height - np.nanmin(height_map)
-    normalised_height_map = zeroed_height_map / np.nanmax(zeroed_height_map) * max_height
+    # Both extremes are taken from the raw data, then the array is shifted and
+    # scaled in place, so no full-size temporaries are created.
+    min_height = np.nanmin(normalised_height_map)
+    max_zeroed_height = np.nanmax(normalised_height_map) - min_height + base_height
+    normalised_height_map += base_height - min_height
+    normalised_height_map *= max_height / max_zeroed_height
 
     scale = max_length / max(normalised_height_map.shape)
 
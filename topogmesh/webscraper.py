@@ -1,17 +1,34 @@
 from shapely.geometry import box
-import osmnx as ox
-from osmnx._errors import InsufficientResponseError
 from yirgacheffe.layers import RasterLayer, VectorLayer
 import yirgacheffe as yg
 from pyproj import Transformer, CRS
 import tempfile
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import zipfile
+import shutil
 from io import BytesIO
-import geopandas as gpd
 from pathlib import Path
 
-ox.settings.use_cache = False
+# Shared by all downloads so connections to the survey service are kept
+# alive and reused, with retries on transient failures.
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=16,
+    max_retries=Retry(total=5, backoff_factor=0.5)
+))
+
+@lru_cache(maxsize=32)
+def _transformer_to_wgs84(src_wkt: str) -> Transformer:
+    """
+    Return a cached transformer from the given CRS to WGS84 lon/lat, so PROJ
+    is only initialised once per source projection.
+    """
+    return Transformer.from_crs(CRS.from_wkt(src_wkt), 4326, always_xy=True)
 
 def mask_from_osm_tags(reference_layer: RasterLayer, tags: dict) -> VectorLayer:
     """
@@ -43,26 +60,34 @@ def mask_from_osm_tags(reference_layer: RasterLayer, tags: dict) -> VectorLayer:
     y_min = reference_layer.area.bottom
     y_max = reference_layer.area.top
 
-    src_crs = CRS.from_wkt(reference_layer.map_projection.name)
-    transformer = Transformer.from_crs(src_crs, 4326, always_xy=True)
+    src_wkt = reference_layer.map_projection.name
+    src_crs = CRS.from_wkt(src_wkt)
+    transformer = _transformer_to_wgs84(src_wkt)
 
-    lon_min, lat_min = transformer.transform(x_min, y_min)
-    lon_max, lat_max = transformer.transform(x_max, y_max)
+    (lon_min, lon_max), (lat_min, lat_max) = transformer.transform([x_min, x_max], [y_min, y_max])
 
     poly_xy = box(x_min, y_min, x_max, y_max)
     poly_latlon = box(lon_min, lat_min, lon_max, lat_max)
 
+    # osmnx takes around a second to import, so only load it once OSM
+    # features are actually requested
+    import osmnx as ox
+    from osmnx._errors import InsufficientResponseError
+    ox.settings.use_cache = False
+
     try:
         gdf = ox.features_from_polygon(poly_latlon, tags=tags)
     except InsufficientResponseError:
         return None
 
-    projected_gdf = gdf.to_crs(src_crs)
+    # Only the geometry is needed for the mask, and FlatGeobuf is a binary
+    # format so it is much quicker to write and read back than GeoJSON.
+    projected_gdf = gdf[["geometry"]].to_crs(src_crs)
     clipped_gdf = projected_gdf.clip(poly_xy)
-    with tempfile.NamedTemporaryFile(suffix=".geojson", delete=True) as tmp:
-        temp_geojson_path = tmp.name
-        clipped_gdf.to_file(temp_geojson_path, driver="GeoJSON")
-        osm_tags_layer = yg.read_shape_like(temp_geojson_path, like=reference_layer)
+    with tempfile.NamedTemporaryFile(suffix=".fgb", delete=True) as tmp:
+        temp_fgb_path = tmp.name
+        clipped_gdf.to_file(temp_fgb_path, driver="FlatGeobuf")
+        osm_tags_layer = yg.read_shape_like(temp_fgb_path, like=reference_layer)
     return osm_tags_layer
 
 
@@ -89,13 +114,20 @@ def get_lidar_layer(base_url: str, output_path: str) -> None:
     print(f"Downloading {base_url}")
     KEY = "?subscription-key=public"
     url = f"{base_url}{KEY}"
-    data = requests.get(url)
-    data.raise_for_status()
-    with zipfile.ZipFile(BytesIO(data.content)) as z:
-        tif_name = next(name for name in z.namelist() if name.lower().endswith(".tif"))
-        with z.open(tif_name) as tif_data:
-            with open(output_path, "wb") as tif:
-                tif.write(tif_data.read())
+    # Stream the archive to a temporary file and the GeoTIFF out of it in
+    # chunks, so memory use stays constant regardless of tile size.
+    CHUNK_SIZE = 1 << 20
+    with _session.get(url, stream=True, timeout=(5, 60)) as data:
+        data.raise_for_status()
+        with tempfile.TemporaryFile() as archive:
+            for chunk in data.iter_content(chunk_size=CHUNK_SIZE):
+                archive.write(chunk)
+            archive.seek(0)
+            with zipfile.ZipFile(archive) as z:
+                tif_name = next(name for name in z.namelist() if name.lower().endswith(".tif"))
+                with z.open(tif_name) as tif_data:
+                    with open(output_path, "wb") as tif:
+                        shutil.copyfileobj(tif_data, tif, CHUNK_SIZE)
 
 def get_uk_tiles(shape_path: str, output_dir: Path) -> None:
     """
@@ -104,7 +136,8 @@ def get_uk_tiles(shape_path: str, output_dir: Path) -> None:
     The function takes a polygon or multipolygon geometry (provided as a geojson
     file), reprojects it to British National Grid (EPSG:27700), and submits it
     to the Environment Agency survey tile search API. It retrieves the most recent
-    matching LiDAR tiles, and downloads them into the specified output directory.
+    matching LiDAR tiles, and downloads them concurrently into the specified
+    output directory.
 
     Parameters
     ----------
@@ -118,6 +151,8 @@ def get_uk_tiles(shape_path: str, output_dir: Path) -> None:
     -------
     None
     """
+    import geopandas as gpd
+
     URL = "https://environment.data.gov.uk/backend/catalog/api/tiles/collections/survey/search"
     
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -128,17 +163,16 @@ def get_uk_tiles(shape_path: str, output_dir: Path) -> None:
         gdf = gdf.to_crs("EPSG:27700")
         gdf.to_file(shapefile_path, driver="ESRI Shapefile")
 
-        with tempfile.NamedTemporaryFile(suffix=".zip") as tmp_zip:
-            with zipfile.ZipFile(tmp_zip, "w", zipfile.ZIP_DEFLATED) as z:
-                for file in tmpdir.iterdir():
-                    if file.suffix in {".shp", ".shx", ".dbf", ".prj"}:
-                        z.write(file, arcname=file.name)
-            tmp_zip.flush()
-            tmp_zip.seek(0)
-            data = tmp_zip.read()
+        # The zipped shapefile is only a few KB, so build it in memory
+        archive = BytesIO()
+        with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as z:
+            for file in tmpdir.iterdir():
+                if file.suffix in {".shp", ".shx", ".dbf", ".prj"}:
+                    z.write(file, arcname=file.name)
+        data = archive.getvalue()
 
     headers = {"Content-Type": "application/zipped-shapefile"}
-    r = requests.post(URL, headers=headers, data=data)
+    r = _session.post(URL, headers=headers, data=data, timeout=(5, 60))
     r.raise_for_status()
     json_data = r.json()
 
@@ -158,13 +192,20 @@ def get_uk_tiles(shape_path: str, output_dir: Path) -> None:
                 selected_data[composite_key] = (year, uri)
 
     get_uris_for_layer = lambda layer_type: [selected_data[(layer, tile)][1] for layer, tile in selected_data if layer == layer_type]
+    uris = []
+    output_paths = []
     for layer_type in wanted_ids:
         layer_dir = Path(f"{output_dir}/{layer_type}")
         layer_dir.mkdir(parents=True, exist_ok=True)
         for uri in get_uris_for_layer(layer_type):
             tile_name = Path(uri).name
-            output_path = layer_dir / tile_name
-            get_lidar_layer(uri, output_path)
+            uris.append(uri)
+            output_paths.append(layer_dir / tile_name)
+
+    # Downloads are I/O-bound and independent, so run several at once
+    MAX_DOWNLOADS = 8
+    with ThreadPoolExecutor(max_workers=MAX_DOWNLOADS) as executor:
+        list(executor.map(get_lidar_layer, uris, output_paths))
 
 if __name__ == "__main__":
     get_uk_tiles("tests/buckingham.geojson", "tests")
\ No newline at end of file